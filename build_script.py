@@ -7,52 +7,38 @@
 
 import os
 import sys
+import hashlib
+import importlib.util
 import shutil
 import subprocess
-import platform
-from pathlib import Path
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
+# 用户态复制时使用的缓冲区大小
+COPY_BUFSIZE = 1024 * 1024
 
-def check_pyinstaller():
-    """检查是否安装了PyInstaller"""
-    try:
-        import PyInstaller
-        return True
-    except ImportError:
-        return False
+# Linux FICLONE ioctl 请求号，用于在 CoW 文件系统上克隆文件
+FICLONE = 0x40049409
 
+# 影响构建结果的输入文件，以及记录上次构建指纹的文件
+BUILD_INPUTS = ["sensitive_extractor.py", "patterns.json", "build_script.py", "icon.ico"]
+BUILD_STAMP = os.path.join("build", ".stamp")
 
-def install_pyinstaller():
-    """安装PyInstaller"""
-    print("正在安装PyInstaller...")
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
-        print("PyInstaller安装完成")
-        return True
-    except subprocess.CalledProcessError:
-        print("PyInstaller安装失败")
-        return False
+# 本脚本生成的 PyInstaller spec 文件
+SPEC_FILE = "sensitive_extractor.spec"
 
+# 程序运行时用不到的标准库/打包工具模块，排除后可缩短分析时间并减小体积
+# 注意: GUI 依赖 tkinter，不能排除
+EXCLUDED_MODULES = [
+    'unittest', 'doctest', 'pydoc', 'pydoc_data', 'pip', 'setuptools', 'wheel',
+    'pkg_resources', 'test', 'lib2to3', 'xmlrpc', 'email', '_decimal',
+]
 
-def get_platform_info():
-    """获取平台信息"""
-    system = platform.system().lower()
-    arch = platform.machine().lower()
-
-    if system == "windows":
-        return "windows", "exe"
-    elif system == "darwin":
-        return "macos", "app"
-    elif system == "linux":
-        return "linux", ""
-    else:
-        return system, ""
-
-
-def create_spec_file():
-    """创建PyInstaller spec文件"""
-    spec_content = """
+# PyInstaller spec文件模板，构建参数全部由spec决定
+SPEC_TEMPLATE = """
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 block_cipher = None
 
@@ -65,9 +51,9 @@ a = Analysis(
     ],
     hiddenimports=[],
     hookspath=[],
-    hooksconfig={},
+    hooksconfig={{}},
     runtime_hooks=[],
-    excludes=[],
+    excludes={excludes},
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
@@ -75,7 +61,10 @@ a = Analysis(
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+{target}"""
 
+# onefile: 所有内容打包进单个可执行文件
+SPEC_ONEFILE_TARGET = """
 exe = EXE(
     pyz,
     a.scripts,
@@ -87,10 +76,10 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
-    console=False,
+    console={console},
     disable_windowed_traceback=False,
     argv_emulation=False,
     target_arch=None,
@@ -100,86 +89,438 @@ exe = EXE(
 )
 """
 
-    with open('sensitive_extractor.spec', 'w', encoding='utf-8') as f:
-        f.write(spec_content)
+# onedir: 可执行文件和依赖放在同一目录，启动时无需自解压
+SPEC_ONEDIR_TARGET = """
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='SensitiveInfoExtractor',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console={console},
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon='icon.ico' if os.path.exists('icon.ico') else None,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='SensitiveInfoExtractor',
+)
+"""
+
+
+@lru_cache(maxsize=None)
+def render_spec(onedir, console):
+    """生成spec文件内容（纯ASCII，编码为字节）"""
+    target = SPEC_ONEDIR_TARGET if onedir else SPEC_ONEFILE_TARGET
+    spec_content = SPEC_TEMPLATE.format(excludes=repr(EXCLUDED_MODULES),
+                                        target=target.format(console=console))
+    return spec_content.encode("ascii")
+
+
+def check_pyinstaller():
+    """检查是否安装了PyInstaller（只查找模块，不执行导入）"""
+    return importlib.util.find_spec("PyInstaller") is not None
+
+
+def install_pyinstaller():
+    """安装PyInstaller"""
+    print("正在安装PyInstaller...")
+
+    # 优先使用 uv，否则使用 pip 并跳过版本自检和缓存写入
+    if shutil.which("uv"):
+        cmd = ["uv", "pip", "install", "--python", sys.executable, "pyinstaller"]
+    else:
+        cmd = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check",
+               "--no-cache-dir", "pyinstaller"]
+
+    try:
+        subprocess.check_call(cmd)
+        print("PyInstaller安装完成")
+        return True
+    except subprocess.CalledProcessError:
+        print("PyInstaller安装失败")
+        return False
+
+
+@lru_cache(maxsize=1)
+def get_platform_info():
+    """获取平台信息（sys.platform 为编译期常量，无需导入 platform 模块）"""
+    system = sys.platform
+
+    if system == "win32":
+        return "windows", "exe"
+    elif system == "darwin":
+        return "macos", "app"
+    elif system.startswith("linux"):
+        return "linux", ""
+    else:
+        return system, ""
+
+
+def create_spec_file(onedir=False, console=False):
+    """创建PyInstaller spec文件"""
+    spec_path = SPEC_FILE
+    spec_bytes = render_spec(onedir, console)
+
+    # 内容未变化时不重复写入
+    try:
+        if os.stat(spec_path).st_size == len(spec_bytes):
+            with open(spec_path, 'rb') as f:
+                if f.read() == spec_bytes:
+                    print("spec文件已是最新")
+                    return
+    except OSError:
+        pass
+
+    fd = os.open(spec_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        os.write(fd, spec_bytes)
+    finally:
+        os.close(fd)
 
     print("已创建spec文件")
 
 
-def build_executable():
-    """构建可执行文件"""
-    platform_name, ext = get_platform_info()
+def create_work_dir():
+    """创建 PyInstaller 的临时工作目录，Linux 下优先使用 tmpfs"""
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm"):
+        try:
+            return tempfile.mkdtemp(prefix="pyi_", dir="/dev/shm")
+        except OSError:
+            pass
+    return tempfile.mkdtemp(prefix="pyi_")
+
+
+def run_pyinstaller_subprocess(pyi_args):
+    """在子进程中运行 PyInstaller 并转发输出，返回退出码"""
+    # -OO 会去掉打包模块中的 assert 和文档字符串，程序逻辑不能依赖它们
+    cmd = [sys.executable, "-OO", "-m", "PyInstaller", *pyi_args]
+
+    # 不在构建目录中写入 __pycache__，并固定哈希种子
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "PYTHONHASHSEED": "0"}
+
+    # Windows 下不为子进程分配新的控制台窗口（conhost.exe），输出仍通过管道转发
+    extra = {}
+    if sys.platform == "win32":
+        extra["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            bufsize=1, text=True, errors='replace', env=env, **extra)
+    # 逐行转发构建输出
+    for line in proc.stdout:
+        print(line, end="")
+    return proc.wait()
 
+
+def run_pyinstaller(pyi_args):
+    """在当前进程中运行 PyInstaller，省去启动新解释器的开销，返回退出码
+
+    进程内构建时打包模块的优化级别与当前解释器一致，如需 -OO 效果，
+    请使用 python -OO build_script.py 运行本脚本。
+    旧版本 PyInstaller 没有 run() 入口时退回子进程方式。
+    """
+    try:
+        import PyInstaller.__main__
+        run = PyInstaller.__main__.run
+    except (ImportError, AttributeError):
+        return run_pyinstaller_subprocess(pyi_args)
+
+    dont_write_bytecode = sys.dont_write_bytecode
+    sys.dont_write_bytecode = True
+    try:
+        run(pyi_args)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    except Exception as e:
+        print(f"PyInstaller 运行出错: {e}")
+        return 1
+    finally:
+        sys.dont_write_bytecode = dont_write_bytecode
+
+
+def build_executable(platform_name, onedir=False):
+    """构建可执行文件
+
+    onedir 为 True 时生成目录形式的程序，启动时无需自解压到临时目录
+    """
     print(f"正在为 {platform_name} 平台构建可执行文件...")
 
-    # 创建spec文件
-    create_spec_file()
+    # 创建spec文件，构建参数统一由spec提供
+    create_spec_file(onedir=onedir, console=(platform_name == "linux"))
 
-    # 构建命令
-    cmd = [
-        sys.executable, "-m", "PyInstaller",
+    # 中间产物放到内存文件系统（Linux 的 /dev/shm）或系统临时目录
+    work_dir = create_work_dir()
+
+    # PyInstaller 参数
+    pyi_args = [
         "--clean",
-        "--onefile",
-        "--windowed" if platform_name != "linux" else "--console",
-        "--name", "SensitiveInfoExtractor",
-        "--add-data", "patterns.json:." if platform_name != "windows" else "patterns.json;.",
+        "--workpath", work_dir,
+        "--distpath", "dist",
+        SPEC_FILE,
     ]
 
-    # 添加图标（如果存在）
-    if os.path.exists("icon.ico"):
-        cmd.extend(["--icon", "icon.ico"])
+    try:
+        # PyInstaller 运行期间，在后台线程中准备发布目录并复制静态文件
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            static_copy = executor.submit(copy_static_files, get_release_dir(platform_name))
+            returncode = run_pyinstaller(pyi_args)
+            static_copy.result()
+    finally:
+        try:
+            _fast_rmtree(work_dir)
+        except OSError:
+            pass
+
+    if returncode != 0:
+        print(f"构建失败: PyInstaller 退出码 {returncode}")
+        return False
+
+    print(f"构建完成！可执行文件位于 dist/ 目录")
+    return True
 
-    cmd.append("sensitive_extractor.py")
 
+def _try_reflink(src_fd, dst_fd):
+    """Linux: 尝试在 btrfs/xfs 等 CoW 文件系统上克隆文件，成功返回 True"""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
     try:
-        subprocess.check_call(cmd)
-        print(f"构建完成！可执行文件位于 dist/ 目录")
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"构建失败: {e}")
+    except OSError:
+        # 文件系统不支持或跨文件系统
         return False
 
 
-def create_release_package():
-    """创建发布包"""
-    platform_name, ext = get_platform_info()
+def _try_clonefile(src, dst):
+    """macOS: 尝试在 APFS 上使用 clonefile 克隆文件，成功返回 True"""
+    if sys.platform != "darwin":
+        return False
+    import ctypes
+    try:
+        libc = ctypes.CDLL("/usr/lib/libSystem.dylib", use_errno=True)
+        # clonefile 要求目标文件不存在
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        return libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0
+    except (OSError, AttributeError):
+        return False
 
-    # 创建发布目录
-    release_dir = Path(f"release/{platform_name}")
-    release_dir.mkdir(parents=True, exist_ok=True)
 
-    # 复制可执行文件
-    dist_dir = Path("dist")
-    if dist_dir.exists():
-        for file in dist_dir.glob("*"):
-            if file.is_file():
-                shutil.copy2(file, release_dir)
+def _copy_fd(src_fd, dst_fd):
+    """在两个文件描述符之间复制数据，优先使用内核态复制"""
+    # CoW 文件系统上直接克隆，无需搬运数据
+    if _try_reflink(src_fd, dst_fd):
+        return
+
+    # Linux: copy_file_range 可在内核中完成复制（支持 CoW / NFS 服务端复制）
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                pass
+            return
+        except OSError:
+            pass
+
+    # sendfile 只在 Linux 上支持普通文件作为目标（macOS/FreeBSD 要求 socket 且 offset 必须为整数）
+    if sys.platform.startswith("linux") and hasattr(os, "sendfile"):
+        try:
+            while os.sendfile(dst_fd, src_fd, None, 1 << 30):
+                pass
+            return
+        except (OSError, TypeError):
+            pass
+
+    # 通用方案: 使用大缓冲区读写，避免反复分配
+    buf = bytearray(COPY_BUFSIZE)
+    view = memoryview(buf)
+    with open(src_fd, "rb", buffering=0, closefd=False) as src:
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                written += os.write(dst_fd, view[written:n])
+
+
+def _fastcopy(src, dst):
+    """复制文件内容及元数据，作用同 shutil.copy2（dst 必须是完整的目标文件路径）"""
+    src, dst = os.fspath(src), os.fspath(dst)
+
+    if sys.platform == "win32":
+        import ctypes
+        # CopyFileW 由系统完成复制，并保留时间戳和属性
+        if ctypes.windll.kernel32.CopyFileW(src, dst, False):
+            return
+
+    if _try_clonefile(src, dst):
+        shutil.copystat(src, dst)
+        return
+
+    flags = getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src, os.O_RDONLY | flags)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | flags, 0o644)
+        try:
+            _copy_fd(src_fd, dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    shutil.copystat(src, dst)
 
-    # 复制配置文件
-    shutil.copy2("patterns.json", release_dir)
 
-    # 复制说明文件
-    if os.path.exists("README.md"):
-        shutil.copy2("README.md", release_dir)
+def _copy_files(copy_jobs):
+    """并发复制多个文件，copy_jobs 为 (源路径, 目标路径) 列表"""
+    if len(copy_jobs) <= 1:
+        for src, dst in copy_jobs:
+            _fastcopy(src, dst)
+        return
+
+    # 文件复制是 I/O 密集型操作，系统调用期间会释放 GIL
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as executor:
+        list(executor.map(lambda job: _fastcopy(*job), copy_jobs))
+
+
+def get_release_dir(platform_name):
+    """获取发布目录"""
+    return os.path.join("release", platform_name)
+
+
+def copy_static_files(release_dir):
+    """创建发布目录，并复制配置文件和说明文件"""
+    os.makedirs(release_dir, exist_ok=True)
+
+    # 复制配置文件和说明文件（说明文件可选）
+    copy_jobs = [(name, os.path.join(release_dir, name))
+                 for name in ("patterns.json", "README.md") if os.path.exists(name)]
+
+    _copy_files(copy_jobs)
+
+
+def create_release_package(platform_name):
+    """创建发布包（配置文件和说明文件已在构建期间复制）"""
+    # 发布目录已在构建期间创建，这里只需确保存在
+    release_dir = get_release_dir(platform_name)
+    os.makedirs(release_dir, exist_ok=True)
+
+    # 先收集所有待复制的文件，再统一复制
+    copy_jobs = []
+
+    # 复制可执行文件
+    if os.path.isdir("dist"):
+        with os.scandir("dist") as it:
+            entries = list(it)
+        for entry in entries:
+            dst = os.path.join(release_dir, entry.name)
+            if entry.is_file():
+                copy_jobs.append((entry.path, dst))
+            elif entry.is_dir():
+                # onedir 模式下 dist 中是整个程序目录，copytree 只负责建目录
+                shutil.copytree(entry.path, dst,
+                                copy_function=lambda src, dst: copy_jobs.append((src, dst)),
+                                dirs_exist_ok=True)
+
+    _copy_files(copy_jobs)
 
     print(f"发布包已创建在 {release_dir}")
 
 
+def _fast_rmtree(path):
+    """删除整个目录树，借助 os.scandir 缓存的目录项类型减少 stat 调用"""
+    # 栈中元素为 (目录, 子项是否已清空)，后序删除目录本身
+    stack = [(os.fspath(path), False)]
+    while stack:
+        current, emptied = stack.pop()
+        if emptied:
+            os.rmdir(current)
+            continue
+
+        stack.append((current, True))
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, False))
+                else:
+                    os.unlink(entry.path)
+
+
 def clean_build():
     """清理构建文件"""
     dirs_to_remove = ["build", "dist", "__pycache__"]
-    files_to_remove = ["*.spec"]
 
     for dir_name in dirs_to_remove:
-        if os.path.exists(dir_name):
-            shutil.rmtree(dir_name)
+        if os.path.isdir(dir_name):
+            _fast_rmtree(dir_name)
             print(f"已删除 {dir_name}")
 
-    import glob
-    for pattern in files_to_remove:
-        for file in glob.glob(pattern):
-            os.remove(file)
-            print(f"已删除 {file}")
+    # 删除旧的 spec 文件；本脚本生成的 spec 保留，内容未变化时 create_spec_file 不再重写
+    with os.scandir(".") as it:
+        spec_files = [entry.name for entry in it
+                      if entry.name.endswith(".spec") and entry.is_file()
+                      and entry.name != SPEC_FILE]
+    for file in spec_files:
+        os.remove(file)
+        print(f"已删除 {file}")
+
+
+def auto_install_enabled():
+    """是否无需确认直接安装PyInstaller（--yes/-y、CI=true 或 PYI_AUTO_INSTALL=1）"""
+    if "--yes" in sys.argv[1:] or "-y" in sys.argv[1:]:
+        return True
+    return (os.environ.get("CI", "").lower() == "true"
+            or os.environ.get("PYI_AUTO_INSTALL") == "1")
+
+
+def compute_build_digest(platform_name, onedir):
+    """根据输入文件的修改时间和大小计算构建指纹（不读取文件内容）"""
+    digest = hashlib.sha256(f"{platform_name}:{onedir}".encode())
+    for name in BUILD_INPUTS:
+        try:
+            st = os.stat(name)
+        except FileNotFoundError:
+            continue
+        digest.update(f"{name}:{st.st_mtime_ns}:{st.st_size};".encode())
+    return digest.hexdigest()
+
+
+def is_build_up_to_date(digest):
+    """判断上次构建的指纹是否与当前一致，且构建产物仍然存在"""
+    if not os.path.isdir("dist") or not os.listdir("dist"):
+        return False
+    try:
+        with open(BUILD_STAMP, 'r', encoding='utf-8') as f:
+            return f.read().strip() == digest
+    except OSError:
+        return False
+
+
+def write_build_stamp(digest):
+    """记录本次构建的指纹"""
+    os.makedirs(os.path.dirname(BUILD_STAMP), exist_ok=True)
+    with open(BUILD_STAMP, 'w', encoding='utf-8') as f:
+        f.write(digest)
 
 
 def main():
@@ -197,18 +538,40 @@ def main():
         print("❌ 错误: 找不到 patterns.json")
         sys.exit(1)
 
+    # 获取平台信息
+    platform_name, ext = get_platform_info()
+    print(f"🔧 检测到平台: {platform_name}")
+
+    # FAST=1 时构建 onedir 版本，省去 onefile 每次启动的自解压开销
+    onedir = os.environ.get("FAST") == "1"
+    if onedir:
+        print("⚡ FAST=1: 使用 onedir 模式构建")
+
+    # 源文件未变化时跳过构建，FORCE=1 可强制重新构建
+    digest = compute_build_digest(platform_name, onedir)
+    if os.environ.get("FORCE") != "1" and is_build_up_to_date(digest):
+        print("✅ 构建产物已是最新，无需重新构建（设置 FORCE=1 可强制构建）")
+        # 发布目录可能已被删除或过期，仍从现有构建产物重新生成发布包
+        print("📦 更新发布包...")
+        copy_static_files(get_release_dir(platform_name))
+        create_release_package(platform_name)
+        print(f"📁 发布包位置: {get_release_dir(platform_name)}/")
+        sys.exit(0)
+
     # 检查PyInstaller
     if not check_pyinstaller():
         print("⚠️  PyInstaller未安装")
-        if input("是否安装PyInstaller? (y/N): ").lower() in ['y', 'yes']:
-            if not install_pyinstaller():
-                sys.exit(1)
-        else:
+        if auto_install_enabled():
+            print("已启用自动安装")
+        elif not sys.stdin.isatty():
+            # 非交互环境下无法询问，直接失败而不是阻塞等待输入
+            print("❌ 非交互环境，请使用 --yes 或设置 PYI_AUTO_INSTALL=1 自动安装")
+            sys.exit(2)
+        elif input("是否安装PyInstaller? (y/N): ").lower() not in ['y', 'yes']:
             sys.exit(1)
 
-    # 获取平台信息
-    platform_name, ext = get_platform_info()
-    print(f"🔧 检测到平台: {platform_name}")
+        if not install_pyinstaller():
+            sys.exit(1)
 
     # 清理之前的构建
     print("🧹 清理之前的构建文件...")
@@ -216,23 +579,24 @@ def main():
 
     # 构建可执行文件
     print("🔨 开始构建...")
-    if build_executable():
+    if build_executable(platform_name, onedir):
         print("✅ 构建成功！")
 
         # 创建发布包
         print("📦 创建发布包...")
-        create_release_package()
+        create_release_package(platform_name)
+        write_build_stamp(digest)
 
         print("🎉 打包完成！")
-        print(f"📁 发布包位置: release/{platform_name}/")
+        print(f"📁 发布包位置: {get_release_dir(platform_name)}/")
 
         # 显示文件大小
-        dist_dir = Path("dist")
-        if dist_dir.exists():
-            for file in dist_dir.glob("*"):
-                if file.is_file():
-                    size = file.stat().st_size / 1024 / 1024  # MB
-                    print(f"📄 {file.name}: {size:.2f} MB")
+        if os.path.isdir("dist"):
+            with os.scandir("dist") as it:
+                for entry in it:
+                    if entry.is_file():
+                        size = entry.stat().st_size / 1024 / 1024  # MB
+                        print(f"📄 {entry.name}: {size:.2f} MB")
     else:
         print("❌ 构建失败")
         sys.exit(1)
@@ -6,7 +6,7 @@
 版本: 3.0
 描述: 扫描指定目录下的文件，提取敏感信息并生成Markdown报告
 新增功能:
-- 多线程处理 + GUI界面 + 进度显示
+- 多进程处理 + GUI界面 + 进度显示
 - 配置文件分离
 - 可执行文件打包
 """
@@ -15,64 +15,248 @@ import os
 import re
 import sys
 import json
+import sqlite3
+import hashlib
 import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache, partial
 import time
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Optional, Iterator
+import codecs
+import mmap
 import mimetypes
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 from queue import Queue, Empty
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-import webbrowser
+# 对话框模块只在用户操作时用到，在对应方法中按需导入以加快启动
+from tkinter import ttk, scrolledtext
+
+# 正则解析器，用于提取规则中必须出现的字面量（Python 3.11 起更名为 re._parser）
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# 可选依赖: Hyperscan 多模式匹配引擎，一次扫描即可筛选出可能命中的规则
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# 可选依赖: Google RE2 线性时间正则引擎，不支持的语法（如反向预查）回退到 re
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# 可选依赖: orjson 更快地解析和写入规则配置文件
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if re2 is not None:
+    # 与 re 一致，. 不匹配换行；按 Latin-1 解释字节，使 GBK 等非 UTF-8 内容也能逐字节匹配
+    RE2_OPTIONS = re2.Options()
+    RE2_OPTIONS.dot_nl = False
+    RE2_OPTIONS.encoding = re2.Options.Encoding.LATIN1
+    RE2_OPTIONS.log_errors = False
+
+    # 多模式集合的 DFA 状态随规则数增长，放宽内存预算，避免大文件扫描中途因内存不足失败
+    RE2_SET_OPTIONS = re2.Options()
+    RE2_SET_OPTIONS.dot_nl = False
+    RE2_SET_OPTIONS.encoding = re2.Options.Encoding.LATIN1
+    RE2_SET_OPTIONS.log_errors = False
+    RE2_SET_OPTIONS.max_mem = 64 << 20
+
+# 支持的文本文件扩展名
+TEXT_EXTENSIONS = frozenset({
+    '.txt', '.md', '.py', '.js', '.html', '.htm', '.css', '.xml', '.json',
+    '.yml', '.yaml', '.ini', '.cfg', '.conf', '.config', '.properties',
+    '.sql', '.sh', '.bat', '.ps1', '.php', '.java', '.cpp', '.c', '.h',
+    '.cs', '.go', '.rs', '.rb', '.pl', '.swift', '.kt', '.scala', '.clj',
+    '.lua', '.r', '.m', '.dart', '.tsx', '.jsx', '.vue', '.log', '.env',
+    '.dockerfile', '.makefile', '.gitignore', '.gitattributes', '.editorconfig'
+})
+
+# 二进制文件扩展名（需要跳过）
+BINARY_EXTENSIONS = frozenset({
+    '.exe', '.dll', '.so', '.dylib', '.bin', '.dat', '.db', '.sqlite',
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.svg', '.webp',
+    '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v',
+    '.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a',
+    '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.lzma',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.class', '.jar', '.war', '.ear', '.pyc', '.pyo', '.pyd'
+})
+
+# 扩展名 -> 是否文本文件，二进制扩展名优先
+EXTENSION_VERDICTS = {**dict.fromkeys(TEXT_EXTENSIONS, True), **dict.fromkeys(BINARY_EXTENSIONS, False)}
+
+# 遍历目录时跳过的隐藏目录和常见的二进制目录
+SKIPPED_DIRS = frozenset({
+    'node_modules', '__pycache__', '.git', '.svn', 'target', 'build',
+    'dist', 'bin', 'obj', 'out', '.idea', '.vscode'
+})
+
+# 需要扫描的隐藏文件
+ALLOWED_HIDDEN_FILES = frozenset({'.env', '.gitignore', '.gitattributes'})
+
+# 正则源码 -> 编译结果，重新加载规则时未改动的规则无需再次编译
+_COMPILE_CACHE = {}
+
+# 扫描结论缓存格式版本，匹配逻辑变化时递增以废弃旧缓存
+CACHE_VERSION = 3
+
+# 规则中的 \u、\U、\N 转义（前面的反斜杠不能是转义自身的反斜杠）
+_UNICODE_ESCAPE = re.compile(r'(?<!\\)(?:\\\\)*\\[uUN]')
+
+# 匹配重叠数字串的规则，按优先级合并为一个正则扫描（同一数字串只归入第一个命中的规则）
+NUMERIC_PATTERN_NAMES = ('大陆手机号', '身份证', '银行卡')
+
+
+def _is_text_regex(regex: str) -> bool:
+    """判断规则是否含非 ASCII 字符或 Unicode 转义，这类规则需在解码后的文本上按字符匹配"""
+    return not regex.isascii() or _UNICODE_ESCAPE.search(regex) is not None
+
+
+@lru_cache(maxsize=None)
+def _ext_verdict(suffix: str) -> Optional[bool]:
+    """根据小写扩展名判断是否为文本文件，无法判断时返回 None"""
+    verdict = EXTENSION_VERDICTS.get(suffix)
+    if verdict is not None or not suffix:
+        return verdict
+
+    # 未收录的扩展名尝试使用MIME类型判断
+    mime_type, _ = mimetypes.guess_type('file' + suffix)
+    if mime_type:
+        return mime_type.startswith('text/') or mime_type in [
+            'application/json', 'application/xml', 'application/javascript'
+        ]
+    return None
+
+
+def _default_cache_path() -> str:
+    """返回当前用户缓存目录下的扫描结论缓存文件路径"""
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+    elif sys.platform.startswith('darwin'):
+        base = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base, 'sensitive_info_extractor', 'scan_cache.sqlite3')
+
+
+def _json_loads(data: bytes):
+    """解析 JSON 字节串，安装了 orjson 时使用 orjson"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """序列化为缩进两格的 UTF-8 JSON 字节串，中文不转义"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+# 规则配置文件的解析结果，按 (路径, 修改时间, 大小) 缓存，文件未改动时无需重新解析
+_patterns_cache = {'key': None, 'data': None, 'enabled': 0}
+
+
+def _load_patterns_file(path: str) -> Dict:
+    """读取并解析规则配置文件，文件未改动时直接返回上次的结果；结构不正确时抛出 ValueError"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if _patterns_cache['key'] != key:
+        with open(path, 'rb') as f:
+            data = _json_loads(f.read())
+        if not isinstance(data, dict):
+            raise ValueError("顶层必须是对象")
+        for name, pattern_info in data.items():
+            if not isinstance(pattern_info, dict):
+                raise ValueError(f"规则 '{name}' 必须是对象")
+        _patterns_cache.update(
+            key=key, data=data,
+            enabled=sum(1 for p in data.values() if p.get('enabled', True))
+        )
+    return _patterns_cache['data']
+
+
+def _validate_patterns_file(path: str) -> Tuple[bool, int, str]:
+    """检查规则配置文件能否解析、已启用规则能否编译，返回 (是否有效, 可用的已启用规则数, 错误或警告信息)"""
+    try:
+        patterns = _load_patterns_file(path)
+    except ValueError as e:
+        # JSON 解析错误同样是 ValueError
+        return False, 0, f"配置文件格式错误: {e}"
+    except Exception as e:
+        return False, 0, f"无法读取配置文件: {e}"
+
+    # 与 reload_patterns 一致：无法编译的规则跳过并给出警告，不影响其余规则；未启用的规则不检查正则
+    invalid = []
+    for name, pattern_info in patterns.items():
+        regex = pattern_info.get("regex")
+        if not isinstance(regex, str):
+            return False, 0, f"规则 '{name}' 缺少 regex 字段"
+        if not pattern_info.get('enabled', True):
+            continue
+        try:
+            re.compile(regex if _is_text_regex(regex) else regex.encode('utf-8'))
+        except re.error as e:
+            invalid.append(f"规则 '{name}' 的正则表达式无效，已跳过: {e}")
+
+    return True, _patterns_cache['enabled'] - len(invalid), "\n".join(invalid)
+
+
+def _enabled_rule_count(path: str) -> Tuple[int, int]:
+    """返回配置文件中 (已启用规则数, 规则总数)"""
+    patterns = _load_patterns_file(path)
+    return _patterns_cache['enabled'], len(patterns)
 
 
 class SensitiveInfoExtractor:
-    def __init__(self, progress_callback=None, status_callback=None):
+    def __init__(self, progress_callback=None, status_callback=None, patterns=None):
         # 进度回调函数
         self.progress_callback = progress_callback
         self.status_callback = status_callback
 
-        # 从配置文件加载规则
-        self.patterns = self.load_patterns()
+        # 从配置文件加载规则并预编译（扫描子进程直接使用主进程传入的规则）
+        self.reload_patterns(patterns)
 
-        # 编译正则表达式以提高性能
-        self.compiled_patterns = {}
-        for name, pattern_info in self.patterns.items():
-            try:
-                self.compiled_patterns[name] = re.compile(pattern_info["regex"], re.DOTALL)
-            except Exception as e:
-                print(f"警告: 无法编译正则表达式 '{name}': {e}")
-
-        # 支持的文本文件扩展名
-        self.text_extensions = {
-            '.txt', '.md', '.py', '.js', '.html', '.htm', '.css', '.xml', '.json',
-            '.yml', '.yaml', '.ini', '.cfg', '.conf', '.config', '.properties',
-            '.sql', '.sh', '.bat', '.ps1', '.php', '.java', '.cpp', '.c', '.h',
-            '.cs', '.go', '.rs', '.rb', '.pl', '.swift', '.kt', '.scala', '.clj',
-            '.lua', '.r', '.m', '.dart', '.tsx', '.jsx', '.vue', '.log', '.env',
-            '.dockerfile', '.makefile', '.gitignore', '.gitattributes', '.editorconfig'
-        }
+        # 判断未知类型文件时读取的文件头大小，读取内容时会复用这部分数据
+        self.sniff_size = 4096
 
-        # 二进制文件扩展名（需要跳过）
-        self.binary_extensions = {
-            '.exe', '.dll', '.so', '.dylib', '.bin', '.dat', '.db', '.sqlite',
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.ico', '.svg', '.webp',
-            '.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v',
-            '.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a',
-            '.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', '.lzma',
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-            '.class', '.jar', '.war', '.ear', '.pyc', '.pyo', '.pyd'
-        }
+        # 不超过该大小的文件直接读入内存，更大的文件才使用 mmap
+        self.mmap_threshold = 1024 * 1024
+
+        # 超过该大小的文件直接跳过，不进入扫描进程池
+        self.max_file_size = 16 * 1024 * 1024
+
+        # 单个文件中每条规则最多保留的匹配数，超出部分丢弃并记录
+        self.max_matches_per_pattern = 1000
+
+        # 扫描结论缓存文件（默认关闭，可设为 _default_cache_path()），只记录未命中文件的键哈希，未改动的文件再次扫描时直接跳过
+        self.cache_file = None
 
         # 扫描结果存储
-        self.results = {}
+        # 文件路径 -> 规则名 -> [(匹配内容, 行号)]，汇总时无需逐层判断键是否存在
+        self.results = defaultdict(lambda: defaultdict(list))
+        # 规则名 -> 文件路径 -> [(匹配内容, 行号)]，与 results 共用同一批列表，按类型展示时无需遍历所有文件
+        self.by_pattern = defaultdict(dict)
+        # 规则名 -> 匹配总数，合并时累加，展示结果时无需再遍历各文件
+        self.pattern_counts = Counter()
         self.scanned_files = []
         self.skipped_files = []
         self.error_files = []
+        # 匹配数超过上限被截断的 (文件路径, 规则名)
+        self.truncated_matches = []
 
-        # 多线程控制
+        # 扫描状态控制
         self.is_scanning = False
         self.scan_cancelled = False
 
@@ -83,10 +267,73 @@ class SensitiveInfoExtractor:
             'skipped_files': 0,
             'error_files': 0,
             'sensitive_items': 0,
+            'truncated': 0,
             'start_time': None,
             'end_time': None
         }
 
+    def reload_patterns(self, patterns=None):
+        """重新加载规则并重建编译结果，修改配置后无需重新创建扫描器"""
+        # 失败时恢复原有规则，避免扫描器停留在新旧规则混杂的状态
+        previous = self.__dict__.copy()
+        try:
+            self.patterns = patterns if patterns is not None else self.load_patterns()
+
+            # 编译正则表达式以提高性能
+            self.compiled_patterns = {}
+            # 去掉 (?i) 后改在小写内容上匹配的规则
+            self.case_folded = set()
+            # 在解码后的文本上按字符匹配的规则（含中文等非 ASCII 字符）
+            self.text_patterns = set()
+            for name, pattern_info in self.patterns.items():
+                regex, folded = self.fold_case(pattern_info["regex"])
+                try:
+                    self.compiled_patterns[name] = self.compile_pattern(regex)
+                except Exception as e:
+                    print(f"警告: 无法编译正则表达式 '{name}': {e}")
+                    continue
+                if folded:
+                    self.case_folded.add(name)
+                if _is_text_regex(regex):
+                    self.text_patterns.add(name)
+
+            # 数字类规则合并后的正则及其分组名 -> 规则名
+            self.fused_pattern, self.fused_groups = self.build_fused_pattern()
+
+            # 每条规则必须出现的最长字面量，内容中不包含时无需调用正则引擎
+            self.required_literals = {}
+            for name, pattern_info in self.patterns.items():
+                if name in self.compiled_patterns:
+                    literal = self.extract_required_literal(pattern_info["regex"])
+                    if literal:
+                        self.required_literals[name] = literal
+
+            # 构建 Hyperscan 预筛选数据库（未安装 hyperscan 时为 None）
+            self.hs_database, self.prefilter_names = self.build_hyperscan_database()
+            # 没有 Hyperscan 时退而使用 RE2 的多模式集合预筛选（未安装 google-re2 时为 None）
+            self.re2_set = None
+            if self.hs_database is None:
+                self.re2_set, self.prefilter_names = self.build_re2_set()
+            # 未能加入预筛选的规则始终逐条匹配
+            self.unfiltered_patterns = {
+                name for name in self.compiled_patterns
+                if name not in self.prefilter_names
+            }
+            # Hyperscan 的 scratch 空间不能在线程间共享，每个线程单独分配
+            self._hs_local = threading.local()
+
+            # 逐条匹配的启用规则及其元数据，扫描每个文件时无需再查询配置（合并正则中的规则除外）
+            fused_names = set(self.fused_groups.values())
+            self.active_patterns = [
+                (name, compiled, self.required_literals.get(name), name in self.case_folded,
+                 name in self.text_patterns)
+                for name, compiled in self.compiled_patterns.items()
+                if self.patterns[name].get('enabled', True) and name not in fused_names
+            ]
+        except Exception:
+            self.__dict__.update(previous)
+            raise
+
     def load_patterns(self) -> Dict:
         """从配置文件加载正则表达式规则"""
         config_file = "patterns.json"
@@ -98,8 +345,7 @@ class SensitiveInfoExtractor:
             print("配置文件创建完成 - 敏感信息提取工具 by 慕鸢")
 
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _load_patterns_file(config_file)
         except Exception as e:
             print(f"加载配置文件失败: {e}")
             return self.get_default_patterns()
@@ -109,8 +355,8 @@ class SensitiveInfoExtractor:
         default_patterns = self.get_default_patterns()
 
         try:
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(default_patterns, f, ensure_ascii=False, indent=2)
+            with open(config_file, 'wb') as f:
+                f.write(_json_dumps(default_patterns))
             print(f"已创建默认配置文件: {config_file} - by 慕鸢")
         except Exception as e:
             print(f"创建配置文件失败: {e}")
@@ -137,7 +383,7 @@ class SensitiveInfoExtractor:
                 "enabled": True
             },
             "银行卡": {
-                "regex": r'\b\d{16,19}\b',
+                "regex": r'(?<![\dA-Za-z])\d{16,19}(?![\dA-Za-z])',
                 "description": "银行卡号",
                 "risk_level": "高",
                 "enabled": True
@@ -149,13 +395,13 @@ class SensitiveInfoExtractor:
                 "enabled": True
             },
             "路径": {
-                "regex": r'(?:https?://|/|\.\./|\./|/[\w-]+)/(?:[\w/.?%&=-]*|[\w-]+)',
+                "regex": r'(?:https?://|\.\.?/|/[\w-]*)/[\w/.?%&=-]*',
                 "description": "文件路径",
                 "risk_level": "低",
                 "enabled": True
             },
             "URL": {
-                "regex": r'(?i)\b((?:https?|ftp|file):\/\/[-a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,63}\b(?:[-a-zA-Z0-9@:%_\+.~#?&\/=]*))\b',
+                "regex": r'(?i)\b((?:https?|ftp|file):\/\/[-a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,63}\b(?:[-a-zA-Z0-9@:%_\+.~#?&\/=]{0,512}))\b',
                 "description": "网址链接",
                 "risk_level": "低",
                 "enabled": True
@@ -179,7 +425,7 @@ class SensitiveInfoExtractor:
                 "enabled": True
             },
             "账户密码": {
-                "regex": r'(?:username|user|account)\s*[:=]\s*[\'\"](.*?)[\'\"]\s*,\s*(?:password|pass)\s*[:=]\s*[\'\"](.*?)[\'\"]',
+                "regex": r'(?:username|user|account)\s*[:=]\s*[\'\"]([^\'\"]{0,128})[\'\"]\s*,\s*(?:password|pass)\s*[:=]\s*[\'\"]([^\'\"]{0,128})[\'\"]',
                 "description": "用户名和密码组合",
                 "risk_level": "高",
                 "enabled": True
@@ -257,132 +503,490 @@ class SensitiveInfoExtractor:
                 "enabled": True
             },
             "RSA公钥": {
-                "regex": r'-----BEGIN(?:\s+\w+)?\s+PUBLIC\s+KEY-----\s*(.*?)\s*-----END(?:\s+\w+)?\s+PUBLIC\s+KEY-----',
+                "regex": r'-----BEGIN(?:\s+\w+)?\s+PUBLIC\s+KEY-----([A-Za-z0-9+/=\s]*?)-----END(?:\s+\w+)?\s+PUBLIC\s+KEY-----',
                 "description": "RSA公钥",
                 "risk_level": "中",
                 "enabled": True
             },
             "RSA私钥": {
-                "regex": r'-----BEGIN(?:\s+RSA)?\s+PRIVATE\s+KEY-----\s*(.*?)\s*-----END(?:\s+RSA)?\s+PRIVATE\s+KEY-----',
+                "regex": r'-----BEGIN(?:\s+RSA)?\s+PRIVATE\s+KEY-----([A-Za-z0-9+/=\s]*?)-----END(?:\s+RSA)?\s+PRIVATE\s+KEY-----',
                 "description": "RSA私钥",
                 "risk_level": "高",
                 "enabled": True
             }
         }
 
-    def is_text_file(self, file_path: str) -> bool:
-        """判断文件是否为文本文件"""
-        path_obj = Path(file_path)
+    def build_hyperscan_database(self):
+        """将启用的规则编译为一个 Hyperscan 预筛选数据库，返回 (数据库, 规则名列表)"""
+        if hyperscan is None:
+            return None, []
 
-        # 检查扩展名
-        if path_obj.suffix.lower() in self.binary_extensions:
-            return False
+        # PREFILTER 模式保证不漏报，SINGLEMATCH 使每条规则最多回调一次
+        flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_DOTALL
 
-        if path_obj.suffix.lower() in self.text_extensions:
-            return True
+        names = []
+        expressions = []
+        for name in self.compiled_patterns:
+            # 按字符匹配的规则无法用字节预筛选，始终逐条匹配
+            if not self.patterns[name].get('enabled', True) or name in self.text_patterns:
+                continue
+            expression = self.patterns[name]["regex"].encode('utf-8')
+            try:
+                hyperscan.Database().compile(expressions=[expression], flags=flags)
+            except hyperscan.error:
+                # Hyperscan 不支持的语法，该规则仍由 re 逐条匹配
+                continue
+            names.append(name)
+            expressions.append(expression)
 
-        # 对于没有扩展名的文件，尝试使用MIME类型判断
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type:
-            return mime_type.startswith('text/') or mime_type in [
-                'application/json', 'application/xml', 'application/javascript'
-            ]
+        if not names:
+            return None, []
+
+        database = hyperscan.Database()
+        database.compile(expressions=expressions, ids=list(range(len(names))), flags=flags)
+        return database, names
+
+    def build_re2_set(self):
+        """将启用的规则编译为一个 RE2 多模式集合，返回 (集合, 规则名列表)"""
+        if re2 is None:
+            return None, []
+
+        regex_set = re2.Set.SearchSet(RE2_SET_OPTIONS)
+        names = []
+        for name in self.compiled_patterns:
+            if not self.patterns[name].get('enabled', True) or name in self.text_patterns:
+                continue
+            try:
+                regex_set.Add(self.patterns[name]["regex"].encode('utf-8'))
+            except re2.error:
+                # RE2 不支持的语法（如反向预查），该规则仍逐条匹配
+                continue
+            names.append(name)
+
+        if not names:
+            return None, []
+
+        # 末尾追加只匹配文本结尾的哨兵，编号为 len(names)；DFA 扫完全部内容时必定命中
+        regex_set.Add(rb'\z')
+        regex_set.Compile()
+        return regex_set, names
+
+    def fold_case(self, regex: str) -> Tuple[str, bool]:
+        """将以 (?i) 开头的规则转为小写形式，返回 (正则, 是否已转换)"""
+        # 按字符匹配的规则保留 (?i)，由 re 按 Unicode 规则忽略大小写
+        if not regex.startswith('(?i)') or _is_text_regex(regex):
+            return regex, False
+
+        # 只转换字面量中的大写字母，保留 \D、\S、\W、\B 等转义
+        folded = re.sub(r'\\.|[A-Z]+', lambda m: m.group(0) if m.group(0)[0] == '\\' else m.group(0).lower(), regex[4:])
+        try:
+            re.compile(folded.encode('utf-8'))
+        except re.error:
+            return regex, False
+        return folded, True
+
+    def compile_pattern(self, regex: str):
+        """将规则编译为 bytes 正则，优先使用 RE2，不支持时回退到 re；含非 ASCII 字符的规则编译为 str 正则"""
+        compiled = _COMPILE_CACHE.get(regex)
+        if compiled is not None:
+            return compiled
+
+        if _is_text_regex(regex):
+            # 中文字符类等编译为 bytes 后会拆成单个字节，只能在解码后的文本上匹配
+            compiled = _COMPILE_CACHE[regex] = re.compile(regex)
+            return compiled
+
+        # 规则均以 ASCII 字面量为锚点，直接编译为 bytes 正则，扫描时无需解码文件
+        source = regex.encode('utf-8')
+        compiled = None
+        if re2 is not None:
+            try:
+                compiled = re2.compile(source, RE2_OPTIONS)
+            except Exception:
+                pass
+        if compiled is None:
+            # \d、\w、\b 只需 ASCII 语义；整个文件一次匹配，. 不跨行，与逐行匹配时的结果一致
+            compiled = re.compile(source, re.ASCII)
+
+        _COMPILE_CACHE[regex] = compiled
+        return compiled
+
+    def build_fused_pattern(self):
+        """将启用的数字类规则合并为带命名分组的单个正则，返回 (正则, 分组名 -> 规则名)"""
+        names = [
+            name for name in NUMERIC_PATTERN_NAMES
+            if name in self.compiled_patterns
+            and self.patterns[name].get('enabled', True)
+            and name not in self.text_patterns
+            # 自带分组的规则合并后编号会错位，仍单独匹配
+            and not self.compiled_patterns[name].groups
+        ]
+        if len(names) < 2:
+            return None, {}
+
+        groups = {f"g{index}": name for index, name in enumerate(names)}
+        regex = '|'.join(f"(?P<{group}>{self.patterns[name]['regex']})" for group, name in groups.items())
+        try:
+            return self.compile_pattern(regex), groups
+        except re.error:
+            return None, {}
+
+    def extract_required_literal(self, regex: str):
+        """提取正则中任何匹配都必须包含的最长连续字面量，返回 (字面量, 是否忽略大小写) 或 None"""
+        try:
+            parsed = sre_parse.parse(regex)
+        except Exception:
+            return None
+
+        ignore_case = bool(parsed.state.flags & re.IGNORECASE)
+        runs = ['']
+
+        def walk(items):
+            for op, av in items:
+                if op is sre_parse.LITERAL:
+                    runs[-1] += chr(av)
+                elif op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+                    # 不改变标志的分组与前后内容是连续的，继续累积
+                    walk(av[3])
+                else:
+                    # 可选、重复、分支、字符类等都会打断字面量
+                    runs.append('')
+
+        walk(parsed)
+        literal = max(runs, key=len)
+        if len(literal) < 2:
+            return None
+        if _is_text_regex(regex):
+            # 按字符匹配的规则在解码后的文本上查找字面量；Unicode 的大小写折叠与 str.lower() 不完全一致，忽略大小写时不检查
+            return None if ignore_case else (literal, False)
+        # bytes 正则的忽略大小写只作用于 ASCII，与 bytes.lower() 一致
+        literal = literal.encode('utf-8')
+        return (literal.lower() if ignore_case else literal), ignore_case
+
+    def get_candidate_patterns(self, content):
+        """使用 Hyperscan 或 RE2 集合一次扫描找出可能命中的规则，无法预筛选时返回 None"""
+        if self.hs_database is None:
+            if self.re2_set is None:
+                return None
+            # DFA 超出内存预算时返回空结果；哨兵未命中即说明没有扫完，此时不做预筛选
+            indexes = self.re2_set.Match(content)
+            sentinel = len(self.prefilter_names)
+            if not indexes or sentinel not in indexes:
+                return None
+            return {self.prefilter_names[index] for index in indexes if index != sentinel} | self.unfiltered_patterns
+
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self.hs_database)
+
+        hits = set()
+
+        def on_match(pattern_id, start, end, flags, context):
+            hits.add(self.prefilter_names[pattern_id])
+
+        # 规则与内容都是字节，\d、\s、\b 等的 ASCII 语义与 bytes 正则一致
+        self.hs_database.scan(content, match_event_handler=on_match, scratch=scratch)
+        return hits | self.unfiltered_patterns
+
+    def classify_by_ext(self, suffix: str) -> Optional[bool]:
+        """根据扩展名判断是否为文本文件，未知扩展名返回 None"""
+        return _ext_verdict(suffix.lower())
+
+    def is_text_file(self, file_path: str) -> Tuple[bool, bytes]:
+        """判断文件是否为文本文件，返回 (是否文本, 已读取的文件头)"""
+        # 检查扩展名（含 MIME 类型判断，结果按扩展名缓存）
+        verdict = self.classify_by_ext(os.path.splitext(file_path)[1])
+        if verdict is not None:
+            return verdict, b''
 
         # 最后尝试读取文件前几个字节来判断
         try:
             with open(file_path, 'rb') as f:
-                chunk = f.read(1024)
-                if b'\x00' in chunk:  # 包含空字节，可能是二进制文件
-                    return False
-                try:
-                    chunk.decode('utf-8')
-                    return True
-                except UnicodeDecodeError:
-                    try:
-                        chunk.decode('gbk')
-                        return True
-                    except UnicodeDecodeError:
-                        return False
+                chunk = f.read(self.sniff_size)
         except (IOError, OSError):
-            return False
+            return False, b''
 
-    def read_file_content(self, file_path: str) -> str:
-        """读取文件内容，尝试多种编码"""
-        encodings = ['utf-8', 'gbk', 'gb2312', 'utf-16', 'latin-1']
+        if b'\x00' in chunk:  # 包含空字节，可能是二进制文件
+            return False, chunk
 
-        for encoding in encodings:
+        # 文件头可能截断在多字节字符中间，未读到文件末尾时允许末尾不完整
+        final = len(chunk) < self.sniff_size
+        for encoding in ('utf-8', 'gbk'):
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
+                codecs.getincrementaldecoder(encoding)().decode(chunk, final)
+                return True, chunk
             except UnicodeDecodeError:
                 continue
-            except Exception as e:
-                self.error_files.append((file_path, str(e)))
-                return ""
+        return False, chunk
 
-        self.error_files.append((file_path, "无法使用任何编码读取文件"))
-        return ""
+    def decode_match(self, raw: bytes) -> str:
+        """将匹配到的字节解码为文本，非 UTF-8 内容按 GBK 解码"""
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return raw.decode('gbk', errors='replace')
+
+    def to_utf8(self, content: bytes) -> bytes:
+        """将 UTF-16 或 GBK 编码的内容转为 UTF-8，使含中文的规则同样能够命中"""
+        # UTF-16 文件中 ASCII 字符之间夹着空字节，必须转码；内容损坏时由调用方记为错误
+        if content[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+            return content.decode('utf-16').encode('utf-8')
+        try:
+            content.decode('utf-8')
+            return content
+        except UnicodeDecodeError:
+            pass
+        try:
+            return content.decode('gbk').encode('utf-8')
+        except UnicodeDecodeError:
+            # 编码无法识别时按原始字节匹配，匹配结果仍由 decode_match 解码
+            return content
 
     def scan_file(self, file_path: str) -> Dict[str, List[Tuple[str, int]]]:
         """扫描单个文件中的敏感信息"""
         if self.scan_cancelled:
             return {}
 
-        if not self.is_text_file(file_path):
+        is_text, head = self.is_text_file(file_path)
+        if not is_text:
             self.skipped_files.append(file_path)
             return {}
 
-        content = self.read_file_content(file_path)
-        if not content:
+        try:
+            # 文件头未读满说明已是完整内容，无需再次打开文件
+            if head and len(head) < self.sniff_size:
+                return self.scan_content(file_path, self.to_utf8(head))
+
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return {}
+                # 小文件建立映射的开销比直接读取更大
+                if size <= self.mmap_threshold:
+                    return self.scan_content(file_path, self.to_utf8(f.read()))
+                # 大文件通过 mmap 直接在文件映射上匹配，避免读入并解码整个文件
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    # UTF-16 文件中 ASCII 字符之间夹着空字节，先转为 UTF-8 再匹配
+                    if content[:2] in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+                        return self.scan_content(file_path, content[:].decode('utf-16').encode('utf-8'))
+                    return self.scan_content(file_path, content)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            self.error_files.append((file_path, str(e)))
             return {}
 
+    def scan_content(self, file_path: str, content) -> Dict[str, List[Tuple[str, int]]]:
+        """在文件内容（bytes 或 mmap）中匹配所有启用的规则"""
         self.scanned_files.append(file_path)
         file_results = {}
 
-        # 按行分割内容以获取行号
-        lines = content.split('\n')
+        # 换行符位置在出现第一个匹配时才统计，没有命中的文件无需再遍历一遍内容
+        newlines = None
+
+        def line_of(offset: int) -> int:
+            # 行号为偏移之前的换行数 + 1，二分查找即可得到，无需按行切分内容
+            nonlocal newlines
+            if newlines is None:
+                # 用 array 存放偏移，大文件的换行表占用约为 int 列表的四分之一
+                newlines = array('q', (m.start() for m in re.finditer(b'\n', content)))
+            return bisect_left(newlines, offset) + 1
+
+        # 预筛选可能命中的规则，其余规则无需再用 re 匹配
+        candidates = self.get_candidate_patterns(content)
+        # 小写内容仅在有忽略大小写的字面量需要检查时才生成一次
+        content_lower = None
+        # 解码后的文本及其换行符位置，仅在有按字符匹配的规则需要时生成
+        text = None
+        text_newlines = None
+
+        def text_line_of(offset: int) -> int:
+            nonlocal text_newlines
+            if text_newlines is None:
+                text_newlines = array('q', (m.start() for m in re.finditer('\n', text)))
+            return bisect_left(text_newlines, offset) + 1
+
+        limit = self.max_matches_per_pattern
+
+        # 数字类规则一次扫描，按命中的分组归入对应规则
+        if self.fused_pattern is not None and (
+                candidates is None or not candidates.isdisjoint(self.fused_groups.values())):
+            capped = set()
+            for match in self.fused_pattern.finditer(content):
+                group = match.lastgroup
+                # RE2 对 bytes 正则返回 bytes 分组名
+                if isinstance(group, bytes):
+                    group = group.decode('ascii')
+                pattern_name = self.fused_groups[group]
+                if pattern_name in capped:
+                    continue
+                matches = file_results.setdefault(pattern_name, [])
+                if len(matches) >= limit:
+                    capped.add(pattern_name)
+                    self.truncated_matches.append((file_path, pattern_name))
+                    # 所有合并的规则都已达到上限时提前结束
+                    if len(capped) == len(self.fused_groups):
+                        break
+                    continue
+                matches.append((self.decode_match(match.group(0)), line_of(match.start())))
 
-        for pattern_name, compiled_pattern in self.compiled_patterns.items():
+        for pattern_name, compiled_pattern, required, folded, is_text in self.active_patterns:
             if self.scan_cancelled:
                 break
 
-            # 检查是否启用该规则
-            if not self.patterns[pattern_name].get('enabled', True):
+            if candidates is not None and pattern_name not in candidates:
+                continue
+
+            if is_text:
+                if text is None:
+                    text = self.decode_match(content[:])
+                if required and text.find(required[0]) == -1:
+                    continue
+                matches = []
+                for match in compiled_pattern.finditer(text):
+                    if len(matches) >= limit:
+                        self.truncated_matches.append((file_path, pattern_name))
+                        break
+                    matches.append((match.group(0), text_line_of(match.start())))
+                if matches:
+                    file_results[pattern_name] = matches
                 continue
 
+            # 必需字面量不存在时，正则不可能命中（mmap 不支持 in 子串判断，统一使用 find）
+            if required:
+                literal, ignore_case = required
+                if ignore_case:
+                    if content_lower is None:
+                        content_lower = content[:].lower()
+                    if content_lower.find(literal) == -1:
+                        continue
+                elif content.find(literal) == -1:
+                    continue
+
+            # 忽略大小写的规则在小写内容上匹配，bytes.lower() 不改变偏移，匹配内容从原文截取
+            if folded:
+                if content_lower is None:
+                    content_lower = content[:].lower()
+                target = content_lower
+            else:
+                target = content
+
             matches = []
 
-            # 在每一行中查找匹配项
-            for line_num, line in enumerate(lines, 1):
-                for match in compiled_pattern.finditer(line):
-                    matches.append((match.group(0), line_num))
+            # 在整个文件内容上查找匹配项
+            for match in compiled_pattern.finditer(target):
+                if len(matches) >= limit:
+                    self.truncated_matches.append((file_path, pattern_name))
+                    break
+                start, end = match.span()
+                matches.append((self.decode_match(content[start:end]), line_of(start)))
 
             if matches:
                 file_results[pattern_name] = matches
 
         return file_results
 
-    def get_all_files(self, directory_path: str) -> List[str]:
-        """获取目录中所有文件的路径"""
-        all_files = []
-        for root, dirs, files in os.walk(directory_path):
-            # 跳过隐藏目录和常见的二进制目录
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {
-                'node_modules', '__pycache__', '.git', '.svn', 'target', 'build',
-                'dist', 'bin', 'obj', 'out', '.idea', '.vscode'
-            }]
-
-            for file in files:
-                if file.startswith('.') and file not in {'.env', '.gitignore', '.gitattributes'}:
-                    continue
+    def iter_files(self, directory_path: str) -> Iterator[Tuple[str, Optional[os.stat_result]]]:
+        """逐个产出目录中需要扫描的 (文件路径, 文件信息)，二进制扩展名和超大文件直接记为跳过"""
+        stack = [directory_path]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
 
-                file_path = os.path.join(root, file)
-                all_files.append(file_path)
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if is_dir:
+                        # 跳过隐藏目录和常见的二进制目录，与 os.walk 一样不进入符号链接目录
+                        if not name.startswith('.') and name not in SKIPPED_DIRS and not entry.is_symlink():
+                            stack.append(entry.path)
+                        continue
+
+                    if name.startswith('.') and name not in ALLOWED_HIDDEN_FILES:
+                        continue
 
-        return all_files
+                    self.stats['total_files'] += 1
 
-    def scan_directory(self, directory_path: str, max_workers: int = 8) -> None:
-        """使用多线程扫描目录中的所有文件"""
+                    # 已知二进制扩展名无需交给扫描进程判断
+                    if self.classify_by_ext(os.path.splitext(name)[1]) is False:
+                        self.skipped_files.append(entry.path)
+                        continue
+
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        # 无法获取文件信息时交给扫描进程处理并记录错误
+                        st = None
+
+                    if st is not None and st.st_size > self.max_file_size:
+                        self.skipped_files.append(entry.path)
+                        continue
+
+                    yield entry.path, st
+
+    def open_cache(self):
+        """打开扫描结论缓存（SQLite），规则或匹配逻辑变化时清空，无法使用时返回 None"""
+        if not self.cache_file:
+            return None
+
+        fingerprint = hashlib.sha1(json.dumps(
+            [CACHE_VERSION, self.max_matches_per_pattern, self.patterns],
+            sort_keys=True, ensure_ascii=False
+        ).encode('utf-8')).hexdigest()
+
+        try:
+            # 缓存只存纯文本的键哈希和结论，不含匹配内容；目录和文件仍只允许当前用户访问
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), mode=0o700, exist_ok=True)
+            os.close(os.open(self.cache_file, os.O_RDWR | os.O_CREAT, 0o600))
+            if os.name == 'posix':
+                os.chmod(self.cache_file, 0o600)
+
+            cache = sqlite3.connect(self.cache_file)
+            cache.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            cache.execute("CREATE TABLE IF NOT EXISTS files (key TEXT PRIMARY KEY, status TEXT)")
+            row = cache.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != fingerprint:
+                cache.execute("DELETE FROM files")
+                cache.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+                cache.commit()
+            return cache
+        except (OSError, sqlite3.Error) as e:
+            print(f"无法打开扫描缓存 {self.cache_file}: {e}")
+            return None
+
+    def cache_key(self, file_path: str, st: os.stat_result) -> str:
+        """由路径、修改时间和大小生成缓存键，缓存中只保存其哈希"""
+        raw = f"{os.path.abspath(file_path)}:{st.st_mtime_ns}:{st.st_size}"
+        return hashlib.sha1(raw.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def merge_file_results(self, file_path: str, file_results: Dict[str, List[Tuple[str, int]]]) -> None:
+        """将单个文件的扫描结果合并到总结果中"""
+        file_entry = self.results[file_path]
+        for pattern_name, matches in file_results.items():
+            entry = file_entry[pattern_name]
+            entry.extend(matches)
+            self.by_pattern[pattern_name][file_path] = entry
+            self.pattern_counts[pattern_name] += len(matches)
+        self.stats['sensitive_items'] += sum(len(matches) for matches in file_results.values())
+
+    def create_executor(self, max_workers: int = None) -> ProcessPoolExecutor:
+        """创建扫描进程池，子进程启动时按当前规则编译一次扫描器"""
+        # 统一使用 spawn：扫描线程与 Tk 主线程并存时 fork 子进程可能死锁，各平台行为也保持一致
+        return ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_scan_worker,
+            initargs=(self.patterns,)
+        )
+
+    def scan_directory(self, directory_path: str, max_workers: int = None,
+                       executor: ProcessPoolExecutor = None) -> None:
+        """使用多进程扫描目录中的所有文件，边遍历目录边提交扫描任务"""
         # 保持 directory_path 为字符串，避免类型不匹配
         if not os.path.exists(directory_path):
             raise FileNotFoundError(f"目录 {directory_path} 不存在")
@@ -393,63 +997,171 @@ class SensitiveInfoExtractor:
         self.is_scanning = True
         self.scan_cancelled = False
         self.stats['start_time'] = datetime.now()
+        self.stats['total_files'] = 0
 
         if self.status_callback:
-            self.status_callback("正在获取文件列表...")
+            self.status_callback("开始扫描...")
 
-        # 获取所有文件
-        all_files = self.get_all_files(directory_path)
-        self.stats['total_files'] = len(all_files)
+        # 正则匹配受 GIL 限制，使用进程池；按批提交文件以摊薄进程间通信开销
+        batch_size = 8
+        # 同时在途的批次数上限，遍历超大目录时内存保持平稳
+        max_pending = 256
 
-        if self.status_callback:
-            self.status_callback(f"找到 {len(all_files)} 个文件，开始扫描...")
-
-        # 使用线程池执行扫描
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交所有任务
-            future_to_file = {
-                executor.submit(self.scan_file, file_path): file_path
-                for file_path in all_files
-            }
+        # 已发现的待扫描文件数和已完成数，目录遍历结束前总数会持续增长
+        discovered = 0
+        completed = 0
 
-            completed = 0
-            for future in as_completed(future_to_file):
-                if self.scan_cancelled:
-                    break
+        def report_progress(file_path):
+            progress = (completed / discovered) * 100
+            current_file = os.path.basename(file_path)
 
-                file_path = future_to_file[future]
-                completed += 1
+            if self.progress_callback:
+                self.progress_callback(progress, current_file)
 
-                try:
-                    file_results = future.result()
+            if self.status_callback:
+                self.status_callback(f"扫描进度: {completed}/{discovered} - {current_file}")
+
+        def collect(future, batch, keys, attempt, used_executor):
+            nonlocal completed
 
-                    if file_results:
-                        if file_path not in self.results:
-                            self.results[file_path] = {}
+            try:
+                batch_results, scanned, skipped, errors, truncated = future.result()
+            except BrokenProcessPool as e:
+                # 子进程异常退出后进程池整体失效，在途批次全部失败；重建进程池后每个批次重试一次
+                if attempt < 1 and not self.scan_cancelled:
+                    if used_executor is executor:
+                        replace_executor()
+                    submit(batch, keys, attempt + 1)
+                    return
+                completed += len(batch)
+                self.error_files.extend((file_path, str(e)) for file_path in batch)
+                return
+            except Exception as e:
+                completed += len(batch)
+                self.error_files.extend((file_path, str(e)) for file_path in batch)
+                return
+
+            completed += len(batch)
+            self.scanned_files.extend(scanned)
+            self.skipped_files.extend(skipped)
+            self.error_files.extend(errors)
+            self.truncated_matches.extend(truncated)
+
+            for file_path, file_results in batch_results:
+                self.merge_file_results(file_path, file_results)
+
+            if cache is not None:
+                # 只记录没有命中的文件的结论；有命中或出错的文件不缓存，下次重新扫描，敏感内容不会落盘
+                hit_set = {file_path for file_path, _ in batch_results}
+                scanned_set = set(scanned)
+                skipped_set = set(skipped)
+                error_set = {file_path for file_path, _ in errors}
+
+                rows = []
+                for file_path, key in zip(batch, keys):
+                    if key is None or file_path in error_set or file_path in hit_set:
+                        continue
+                    if file_path in skipped_set:
+                        rows.append((key, 'skipped'))
+                    elif file_path in scanned_set:
+                        rows.append((key, 'clean'))
+                    else:
+                        rows.append((key, 'empty'))
+                cache.executemany("INSERT OR REPLACE INTO files VALUES (?, ?)", rows)
+
+            report_progress(batch[-1])
+
+        def apply_cached(file_path, status):
+            if status == 'skipped':
+                self.skipped_files.append(file_path)
+            elif status == 'clean':
+                self.scanned_files.append(file_path)
+
+        cache = self.open_cache()
+
+        # 传入的进程池须由相同规则的 create_executor 创建，扫描结束后不关闭，供下次扫描复用
+        owns_executor = executor is None
+        if owns_executor:
+            executor = self.create_executor(max_workers)
+        pending = {}
+
+        def replace_executor():
+            nonlocal executor, owns_executor
+            if owns_executor:
+                executor.shutdown(wait=False)
+            # 传入的进程池由调用方负责关闭，这里只改用新建的进程池，扫描结束后关闭
+            executor = self.create_executor(max_workers)
+            owns_executor = True
+
+        def submit(batch, keys, attempt=0):
+            try:
+                future = executor.submit(_scan_worker, batch)
+            except BrokenProcessPool:
+                replace_executor()
+                future = executor.submit(_scan_worker, batch)
+            pending[future] = (batch, keys, attempt, executor)
+
+        def drain(block: bool):
+            # block 为 False 时只收集已完成的批次，不等待
+            done, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future, *pending.pop(future))
 
-                        for pattern_name, matches in file_results.items():
-                            if pattern_name not in self.results[file_path]:
-                                self.results[file_path][pattern_name] = []
-                            self.results[file_path][pattern_name].extend(matches)
-                            self.stats['sensitive_items'] += len(matches)
+        try:
+            batch = []
+            keys = []
+            for file_path, st in self.iter_files(directory_path):
+                if self.scan_cancelled:
+                    break
 
-                    # 更新进度
-                    progress = (completed / len(all_files)) * 100
-                    current_file = os.path.basename(file_path)
+                discovered += 1
+
+                key = None
+                if cache is not None and st is not None:
+                    key = self.cache_key(file_path, st)
+                    row = cache.execute("SELECT status FROM files WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        # 文件未改动且上次没有命中，直接复用结论
+                        apply_cached(file_path, row[0])
+                        completed += 1
+                        report_progress(file_path)
+                        continue
+
+                batch.append(file_path)
+                keys.append(key)
+                if len(batch) < batch_size:
+                    continue
 
-                    if self.progress_callback:
-                        self.progress_callback(progress, current_file)
+                submit(batch, keys)
+                batch = []
+                keys = []
+                drain(block=len(pending) >= max_pending)
 
-                    if self.status_callback:
-                        self.status_callback(f"扫描进度: {completed}/{len(all_files)} - {current_file}")
+            if batch and not self.scan_cancelled:
+                submit(batch, keys)
 
-                except Exception as e:
-                    self.error_files.append((file_path, str(e)))
+            while pending and not self.scan_cancelled:
+                drain(block=True)
+        finally:
+            # 取消扫描时丢弃尚未开始的批次
+            if owns_executor:
+                executor.shutdown(wait=True, cancel_futures=self.scan_cancelled)
+            else:
+                # 复用的进程池不关闭，只撤下本次扫描未开始的批次并等待正在执行的批次结束
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+            if cache is not None:
+                try:
+                    cache.commit()
+                finally:
+                    cache.close()
 
         # 更新统计信息
         self.stats['scanned_files'] = len(self.scanned_files)
         self.stats['skipped_files'] = len(self.skipped_files)
         self.stats['error_files'] = len(self.error_files)
+        self.stats['truncated'] = len(self.truncated_matches)
         self.stats['end_time'] = datetime.now()
 
         self.is_scanning = False
@@ -472,107 +1184,149 @@ class SensitiveInfoExtractor:
         if self.stats['start_time'] and self.stats['end_time']:
             duration = str(self.stats['end_time'] - self.stats['start_time'])
 
+        # 根据风险等级设置表情符号
+        risk_emoji = {"高": "🔴", "中": "🟡", "低": "🟢"}
+
+        # 匹配数被截断的 (文件路径, 规则名)
+        truncated = set(self.truncated_matches)
+
+        out = []
+        write = out.append
+
+        write(f"# 🔍 敏感信息扫描报告 - by 慕鸢\n\n")
+        write(f"**生成时间**: {timestamp}\n")
+        if duration:
+            write(f"**扫描用时**: {duration}\n")
+        write(f"\n## 📊 统计信息\n\n")
+        write(f"| 项目 | 数量 |\n")
+        write(f"|------|------|\n")
+        write(f"| 总文件数 | {self.stats['total_files']} |\n")
+        write(f"| 已扫描文件 | {self.stats['scanned_files']} |\n")
+        write(f"| 跳过文件 | {self.stats['skipped_files']} |\n")
+        write(f"| 错误文件 | {self.stats['error_files']} |\n")
+        write(f"| 敏感信息总数 | {self.stats['sensitive_items']} |\n")
+        write(f"| 截断的匹配 | {self.stats['truncated']} |\n\n")
+
+        # 按敏感信息类型分组的结果和数量都已在合并时统计
+        pattern_counts = self.pattern_counts
+
+        # 生成概览
+        write("## 🔍 敏感信息概览\n\n")
+        if pattern_counts:
+            write("| 敏感信息类型 | 数量 | 风险等级 | 描述 |\n")
+            write("|-------------|------|----------|------|\n")
+            for pattern_name in sorted(pattern_counts):
+                count = pattern_counts[pattern_name]
+                risk_level = self.patterns[pattern_name]["risk_level"]
+                description = self.patterns[pattern_name]["description"]
+                risk_display = f"{risk_emoji.get(risk_level, '⚪')} {risk_level}"
+
+                write(f"| {pattern_name} | {count} | {risk_display} | {description} |\n")
+        else:
+            write("✅ 未发现敏感信息\n")
+
+        write("\n---\n\n")
+
+        # 按类型详细列出敏感信息
+        for pattern_name in sorted(pattern_counts):
+            risk_level = self.patterns[pattern_name]["risk_level"]
+
+            write(f"## {risk_emoji.get(risk_level, '⚪')} {pattern_name}\n\n")
+            write(f"**描述**: {self.patterns[pattern_name]['description']}\n")
+            write(f"**风险等级**: {risk_level}\n")
+            write(f"**发现数量**: {pattern_counts[pattern_name]}\n\n")
+
+            # 按文件分组
+            file_groups = self.by_pattern[pattern_name]
+            for file_path in sorted(file_groups):
+                write(f"### 📁 {file_path}\n\n")
+                if (file_path, pattern_name) in truncated:
+                    write(f"> ⚠️ 匹配数量超过 {self.max_matches_per_pattern} 条，仅保留前 {self.max_matches_per_pattern} 条\n\n")
+                matches = file_groups[file_path]
+
+                # 去重并保持行号信息
+                unique_matches = defaultdict(set)
+                for match, line_num in matches:
+                    unique_matches[match].add(line_num)
+
+                for match, line_nums in unique_matches.items():
+                    line_nums_str = ", ".join(map(str, sorted(line_nums)))
+                    write(f"- **内容**: `{match}`\n- **行号**: {line_nums_str}\n\n")
+
+            write("\n---\n\n")
+
+        # 添加跳过的文件列表
+        if self.skipped_files:
+            write("## 🚫 跳过的文件\n\n")
+            write("以下文件被识别为二进制文件或不支持的格式，已跳过扫描：\n\n")
+            out.extend(f"- {file_path}\n" for file_path in sorted(self.skipped_files))
+            write("\n")
+
+        # 添加错误的文件列表
+        if self.error_files:
+            write("## ❌ 错误的文件\n\n")
+            write("以下文件在扫描过程中出现错误：\n\n")
+            for file_path, error in self.error_files:
+                write(f"- **文件**: {file_path}\n- **错误**: {error}\n\n")
+
+        write("\n---\n\n")
+        write("## 📄 工具信息\n\n")
+        write("**工具名称**: 敏感信息提取工具 v3.0\n")
+        write("**作者**: 慕鸢\n")
+        write("**许可证**: MIT License\n")
+        write("**说明**: 本工具仅用于安全检测和代码审计，请在合法合规的范围内使用\n\n")
+        write("---\n\n")
+        write("*报告由敏感信息提取工具生成 - by 慕鸢*\n")
+
+        # 先在内存中拼接完整报告，再一次性写入文件
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"# 🔍 敏感信息扫描报告 - by 慕鸢\n\n")
-            f.write(f"**生成时间**: {timestamp}\n")
-            if duration:
-                f.write(f"**扫描用时**: {duration}\n")
-            f.write(f"\n## 📊 统计信息\n\n")
-            f.write(f"| 项目 | 数量 |\n")
-            f.write(f"|------|------|\n")
-            f.write(f"| 总文件数 | {self.stats['total_files']} |\n")
-            f.write(f"| 已扫描文件 | {self.stats['scanned_files']} |\n")
-            f.write(f"| 跳过文件 | {self.stats['skipped_files']} |\n")
-            f.write(f"| 错误文件 | {self.stats['error_files']} |\n")
-            f.write(f"| 敏感信息总数 | {self.stats['sensitive_items']} |\n\n")
-
-            # 按敏感信息类型分组
-            pattern_summary = {}
-            for file_path, file_results in self.results.items():
-                for pattern_name, matches in file_results.items():
-                    if pattern_name not in pattern_summary:
-                        pattern_summary[pattern_name] = []
-                    pattern_summary[pattern_name].extend([(file_path, match, line_num) for match, line_num in matches])
-
-            # 生成概览
-            f.write("## 🔍 敏感信息概览\n\n")
-            if pattern_summary:
-                f.write("| 敏感信息类型 | 数量 | 风险等级 | 描述 |\n")
-                f.write("|-------------|------|----------|------|\n")
-                for pattern_name in sorted(pattern_summary.keys()):
-                    count = len(pattern_summary[pattern_name])
-                    risk_level = self.patterns[pattern_name]["risk_level"]
-                    description = self.patterns[pattern_name]["description"]
-
-                    # 根据风险等级设置表情符号
-                    risk_emoji = {"高": "🔴", "中": "🟡", "低": "🟢"}
-                    risk_display = f"{risk_emoji.get(risk_level, '⚪')} {risk_level}"
-
-                    f.write(f"| {pattern_name} | {count} | {risk_display} | {description} |\n")
-            else:
-                f.write("✅ 未发现敏感信息\n")
+            f.writelines(out)
 
-            f.write("\n---\n\n")
+# 扫描子进程中的扫描器实例，由进程池初始化函数创建
+_worker_scanner = None
 
-            # 按类型详细列出敏感信息
-            for pattern_name in sorted(pattern_summary.keys()):
-                risk_level = self.patterns[pattern_name]["risk_level"]
-                risk_emoji = {"高": "🔴", "中": "🟡", "低": "🟢"}
-
-                f.write(f"## {risk_emoji.get(risk_level, '⚪')} {pattern_name}\n\n")
-                f.write(f"**描述**: {self.patterns[pattern_name]['description']}\n")
-                f.write(f"**风险等级**: {risk_level}\n")
-                f.write(f"**发现数量**: {len(pattern_summary[pattern_name])}\n\n")
-
-                # 按文件分组
-                file_groups = {}
-                for file_path, match, line_num in pattern_summary[pattern_name]:
-                    if file_path not in file_groups:
-                        file_groups[file_path] = []
-                    file_groups[file_path].append((match, line_num))
-
-                for file_path in sorted(file_groups.keys()):
-                    f.write(f"### 📁 {file_path}\n\n")
-                    matches = file_groups[file_path]
-
-                    # 去重并保持行号信息
-                    unique_matches = {}
-                    for match, line_num in matches:
-                        if match not in unique_matches:
-                            unique_matches[match] = []
-                        unique_matches[match].append(line_num)
-
-                    for match, line_nums in unique_matches.items():
-                        line_nums_str = ", ".join(map(str, sorted(set(line_nums))))
-                        f.write(f"- **内容**: `{match}`\n")
-                        f.write(f"- **行号**: {line_nums_str}\n\n")
-
-                f.write("\n---\n\n")
-
-            # 添加跳过的文件列表
-            if self.skipped_files:
-                f.write("## 🚫 跳过的文件\n\n")
-                f.write("以下文件被识别为二进制文件或不支持的格式，已跳过扫描：\n\n")
-                for file_path in sorted(self.skipped_files):
-                    f.write(f"- {file_path}\n")
-                f.write("\n")
-
-            # 添加错误的文件列表
-            if self.error_files:
-                f.write("## ❌ 错误的文件\n\n")
-                f.write("以下文件在扫描过程中出现错误：\n\n")
-                for file_path, error in self.error_files:
-                    f.write(f"- **文件**: {file_path}\n")
-                    f.write(f"- **错误**: {error}\n\n")
-
-            f.write("\n---\n\n")
-            f.write("## 📄 工具信息\n\n")
-            f.write("**工具名称**: 敏感信息提取工具 v3.0\n")
-            f.write("**作者**: 慕鸢\n")
-            f.write("**许可证**: MIT License\n")
-            f.write("**说明**: 本工具仅用于安全检测和代码审计，请在合法合规的范围内使用\n\n")
-            f.write("---\n\n")
-            f.write("*报告由敏感信息提取工具生成 - by 慕鸢*\n")
+
+def _init_scan_worker(patterns: Dict) -> None:
+    """进程池初始化函数：在子进程中按主进程的规则重新编译扫描器"""
+    global _worker_scanner
+    _worker_scanner = SensitiveInfoExtractor(patterns=patterns)
+
+
+def _scan_worker(file_paths: List[str]):
+    """在子进程中扫描一批文件，返回 (命中结果, 已扫描, 已跳过, 错误, 截断) 供主进程汇总"""
+    scanner = _worker_scanner
+    batch_results = []
+    for file_path in file_paths:
+        try:
+            file_results = scanner.scan_file(file_path)
+        except Exception as e:
+            scanner.error_files.append((file_path, str(e)))
+            continue
+        if file_results:
+            batch_results.append((file_path, file_results))
+
+    # 取走本批次的文件状态，避免在子进程中不断累积
+    scanned, scanner.scanned_files = scanner.scanned_files, []
+    skipped, scanner.skipped_files = scanner.skipped_files, []
+    errors, scanner.error_files = scanner.error_files, []
+    truncated, scanner.truncated_matches = scanner.truncated_matches, []
+    return batch_results, scanned, skipped, errors, truncated
+
+
+def _open_externally(path: str) -> None:
+    """用系统默认程序打开文件，不经过 shell，也不等待程序退出"""
+    if sys.platform.startswith('win'):
+        os.startfile(path)
+        return
+
+    import subprocess
+    opener = 'open' if sys.platform.startswith('darwin') else 'xdg-open'
+    subprocess.Popen([opener, path], start_new_session=True,
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+# 风险等级 -> 结果列表中的颜色标签
+RISK_TAGS = {"高": 'high_risk', "中": 'medium_risk'}
 
 
 class SensitiveInfoGUI:
@@ -599,11 +1353,24 @@ class SensitiveInfoGUI:
         self.scan_directory = tk.StringVar()
         self.output_file = tk.StringVar(value="sensitive_info_report.md")
         self.max_workers = tk.StringVar(value="8")
+        # 单个文件大小上限（MB），超过的文件不读取直接跳过
+        self.max_file_size_mb = tk.StringVar(value="16")
+        # 是否启用扫描结论缓存（默认关闭）
+        self.use_cache = tk.BooleanVar(value=False)
 
         # 扫描器实例
         self.scanner = None
         self.scan_thread = None
 
+        # 扫描进程池在多次扫描间复用，进程数或规则变化时才重建
+        self._pool = None
+        self._pool_key = None
+
+        # 扫描线程发来的界面更新，由主线程定时取出处理（Tk 控件只能在主线程中操作）
+        self.ui_queue = Queue()
+        # 上次刷新界面的时间，刷新频率限制在 30 次/秒以内
+        self._last_ui_flush = 0.0
+
         # 创建界面
         self.create_widgets()
 
@@ -619,7 +1386,7 @@ class SensitiveInfoGUI:
         title_label = ttk.Label(title_frame, text="🔍 敏感信息提取工具 v3.0 - by 慕鸢", style='Title.TLabel')
         title_label.pack()
 
-        subtitle_label = ttk.Label(title_frame, text="扫描目录中的敏感信息并生成详细报告 | 支持多线程 | 配置文件可定制")
+        subtitle_label = ttk.Label(title_frame, text="扫描目录中的敏感信息并生成详细报告 | 支持多进程 | 配置文件可定制")
         subtitle_label.pack()
 
         # 创建笔记本控件（标签页）
@@ -695,18 +1462,22 @@ class SensitiveInfoGUI:
         workers_frame = ttk.Frame(advanced_frame)
         workers_frame.pack(fill='x', pady=5)
 
-        ttk.Label(workers_frame, text="并发线程数:").pack(side='left')
+        ttk.Label(workers_frame, text="并发进程数:").pack(side='left')
 
-        # 创建线程数选择下拉框
+        # 创建进程数选择下拉框
         self.workers_combo = ttk.Combobox(workers_frame, textvariable=self.max_workers,
                                           values=["2", "4", "8", "16"],
                                           state="readonly", width=10)
         self.workers_combo.pack(side='left', padx=10)
 
         # 添加说明
-        info_label = ttk.Label(workers_frame, text="(推荐: 8线程, 根据CPU核心数调整)")
+        info_label = ttk.Label(workers_frame, text="(推荐: 与CPU核心数一致)")
         info_label.pack(side='left', padx=10)
 
+        # 缓存保存在用户缓存目录中，只记录未命中文件的键哈希
+        ttk.Checkbutton(advanced_frame, text="缓存无敏感信息文件的扫描结论（再次扫描时跳过未改动的文件）",
+                        variable=self.use_cache).pack(anchor='w', pady=(5, 0))
+
         # 进度显示
         progress_frame = ttk.LabelFrame(self.scan_frame, text="📈 扫描进度", padding=10)
         progress_frame.pack(fill='x', padx=10, pady=5)
@@ -756,7 +1527,8 @@ class SensitiveInfoGUI:
             ("已扫描", "scanned_files"),
             ("已跳过", "skipped_files"),
             ("错误文件", "error_files"),
-            ("敏感信息", "sensitive_items")
+            ("敏感信息", "sensitive_items"),
+            ("已截断", "truncated")
         ]
 
         for i, (label, key) in enumerate(stats_items):
@@ -791,6 +1563,11 @@ class SensitiveInfoGUI:
         self.result_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
 
+        # 配置标签颜色（只需配置一次）
+        self.result_tree.tag_configure('high_risk', foreground='red')
+        self.result_tree.tag_configure('medium_risk', foreground='orange')
+        self.result_tree.tag_configure('low_risk', foreground='green')
+
         # 绑定双击事件
         self.result_tree.bind('<Double-1>', self.on_tree_double_click)
 
@@ -803,16 +1580,9 @@ class SensitiveInfoGUI:
         config_file_path = os.path.abspath("patterns.json")
         ttk.Label(info_frame, text=f"配置文件位置: {config_file_path}").pack(anchor='w')
 
-        if os.path.exists("patterns.json"):
-            try:
-                with open("patterns.json", 'r', encoding='utf-8') as f:
-                    patterns = json.load(f)
-                enabled_count = sum(1 for p in patterns.values() if p.get('enabled', True))
-                ttk.Label(info_frame, text=f"已启用规则: {enabled_count}/{len(patterns)}").pack(anchor='w')
-            except:
-                ttk.Label(info_frame, text="配置文件读取错误", foreground='red').pack(anchor='w')
-        else:
-            ttk.Label(info_frame, text="配置文件不存在，将自动创建", foreground='orange').pack(anchor='w')
+        self.rules_label = ttk.Label(info_frame)
+        self.rules_label.pack(anchor='w')
+        self.refresh_config_info()
 
         # 配置操作按钮
         button_frame = ttk.Frame(info_frame)
@@ -822,6 +1592,23 @@ class SensitiveInfoGUI:
         ttk.Button(button_frame, text="🔄 重新加载", command=self.reload_config).pack(side='left', padx=5)
         ttk.Button(button_frame, text="📋 查看示例", command=self.show_config_example).pack(side='left', padx=5)
 
+        # 扫描限制
+        limits_frame = ttk.LabelFrame(self.config_frame, text="📏 扫描限制", padding=10)
+        limits_frame.pack(fill='x', padx=10, pady=5)
+
+        size_frame = ttk.Frame(limits_frame)
+        size_frame.pack(fill='x', pady=(0, 5))
+        ttk.Label(size_frame, text="最大文件大小 (MB):").pack(side='left')
+        ttk.Combobox(size_frame, textvariable=self.max_file_size_mb,
+                     values=["1", "4", "16", "64", "256"],
+                     state="readonly", width=10).pack(side='left', padx=10)
+        ttk.Label(size_frame, text="(超过该大小的文件直接跳过，不读取内容)").pack(side='left', padx=10)
+
+        ttk.Label(limits_frame, text=f"按文本扫描的扩展名 ({len(TEXT_EXTENSIONS)} 种): "
+                                     + " ".join(sorted(TEXT_EXTENSIONS)),
+                  wraplength=820).pack(anchor='w')
+        ttk.Label(limits_frame, text="其他未知扩展名的文件读取文件头判断是否为文本").pack(anchor='w')
+
         # 配置说明
         help_frame = ttk.LabelFrame(self.config_frame, text="📚 配置说明", padding=10)
         help_frame.pack(fill='both', expand=True, padx=10, pady=5)
@@ -857,14 +1644,27 @@ class SensitiveInfoGUI:
         help_text_widget.insert(tk.END, help_text)
         help_text_widget.config(state='disabled')
 
+    def refresh_config_info(self):
+        """更新配置页中的规则数量，配置文件未改动时不重新解析"""
+        if os.path.exists("patterns.json"):
+            try:
+                enabled_count, total = _enabled_rule_count("patterns.json")
+                self.rules_label.config(text=f"已启用规则: {enabled_count}/{total}", foreground='')
+            except Exception:
+                self.rules_label.config(text="配置文件读取错误", foreground='red')
+        else:
+            self.rules_label.config(text="配置文件不存在，将自动创建", foreground='orange')
+
     def browse_directory(self):
         """浏览选择目录"""
+        from tkinter import filedialog
         directory = filedialog.askdirectory()
         if directory:
             self.scan_directory.set(directory)
 
     def browse_output_file(self):
         """选择输出文件"""
+        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
             defaultextension=".md",
             filetypes=[("Markdown files", "*.md"), ("All files", "*.*")]
@@ -876,7 +1676,7 @@ class SensitiveInfoGUI:
         """更新进度条"""
         self.progress['value'] = progress
         self.current_file_label.config(text=f"当前文件: {current_file}")
-        self.root.update_idletasks()
+        self.flush_ui()
 
     def update_status(self, status):
         """更新状态标签"""
@@ -884,10 +1684,18 @@ class SensitiveInfoGUI:
         # 同时更新状态栏
         if hasattr(self, 'status_info'):
             self.status_info.config(text=status)
-        self.root.update_idletasks()
+        self.flush_ui()
+
+    def flush_ui(self):
+        """刷新界面，距上次刷新不足 1/30 秒时跳过"""
+        now = time.monotonic()
+        if now - self._last_ui_flush > 0.033:
+            self.root.update_idletasks()
+            self._last_ui_flush = now
 
     def start_scan(self):
         """开始扫描"""
+        from tkinter import messagebox
         if not self.scan_directory.get():
             messagebox.showerror("错误", "请选择扫描目录")
             return
@@ -903,35 +1711,90 @@ class SensitiveInfoGUI:
 
         # 清空进度和结果
         self.progress['value'] = 0
-        self.current_file_label.config(text="")
+        if str(self.current_file_label.cget('text')):
+            self.current_file_label.config(text="")
         self.clear_results()
 
-        # 创建扫描器
+        # 创建扫描器，回调只把更新放入队列，不在扫描线程中直接操作界面
         self.scanner = SensitiveInfoExtractor(
-            progress_callback=self.update_progress,
-            status_callback=self.update_status
+            progress_callback=partial(self.post_ui_event, 'progress'),
+            status_callback=partial(self.post_ui_event, 'status')
         )
+        self.scanner.max_file_size = int(self.max_file_size_mb.get()) * 1024 * 1024
+        if self.use_cache.get():
+            self.scanner.cache_file = _default_cache_path()
+        pool = self.get_scan_pool(int(self.max_workers.get()))
 
         # 在新线程中运行扫描
-        self.scan_thread = threading.Thread(target=self.run_scan)
+        self.scan_thread = threading.Thread(target=self.run_scan, args=(pool,))
         self.scan_thread.daemon = True
         self.scan_thread.start()
-
-    def run_scan(self):
+        self.root.after(33, self.poll_ui_queue)
+
+    def get_scan_pool(self, workers: int) -> ProcessPoolExecutor:
+        """返回可复用的扫描进程池，子进程中已编译好的规则无需每次扫描重新编译"""
+        key = (workers, self.scanner.patterns)
+        # 上次扫描中子进程异常退出的进程池已无法提交任务，需要重建
+        broken = self._pool is not None and getattr(self._pool, '_broken', False)
+        if self._pool is None or self._pool_key != key or broken:
+            self.shutdown_scan_pool()
+            self._pool = self.scanner.create_executor(workers)
+            self._pool_key = key
+        return self._pool
+
+    def shutdown_scan_pool(self):
+        """关闭扫描进程池，未开始的批次直接丢弃"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool_key = None
+
+    def run_scan(self, pool):
         """运行扫描（在单独线程中）"""
         try:
-            workers = int(self.max_workers.get())
             if self.scanner is not None:
-                self.scanner.scan_directory(self.scan_directory.get(), workers)
+                self.scanner.scan_directory(self.scan_directory.get(), executor=pool)
 
             # 扫描完成后更新GUI
-            self.root.after(0, self.scan_completed)
+            self.post_ui_event('done')
 
         except Exception as e:
-            self.root.after(0, lambda: self.scan_error(str(e)))
+            self.post_ui_event('error', str(e))
+
+    def post_ui_event(self, kind, *args):
+        """在扫描线程中调用：将界面更新放入队列"""
+        self.ui_queue.put((kind, args))
+
+    def poll_ui_queue(self):
+        """在主线程中处理扫描线程发来的界面更新，扫描结束前持续轮询"""
+        # 两次轮询之间积累的进度和状态只需显示最新的一条
+        latest = {}
+        finished = None
+        try:
+            while finished is None:
+                kind, args = self.ui_queue.get_nowait()
+                if kind in ('done', 'error'):
+                    finished = (kind, args)
+                else:
+                    latest[kind] = args
+        except Empty:
+            pass
+
+        if 'progress' in latest:
+            self.update_progress(*latest['progress'])
+        if 'status' in latest:
+            self.update_status(*latest['status'])
+
+        if finished is None:
+            self.root.after(33, self.poll_ui_queue)
+        elif finished[0] == 'done':
+            self.scan_completed()
+        else:
+            self.scan_error(*finished[1])
 
     def scan_completed(self):
         """扫描完成后的处理"""
+        from tkinter import messagebox
         if self.scanner and not self.scanner.scan_cancelled:
             # 生成报告
             try:
@@ -955,6 +1818,9 @@ class SensitiveInfoGUI:
 
     def scan_error(self, error_message):
         """扫描出错时的处理"""
+        from tkinter import messagebox
+        # 子进程异常退出后进程池无法继续使用，下次扫描时重建
+        self.shutdown_scan_pool()
         messagebox.showerror("扫描错误", f"扫描过程中发生错误:\n{error_message}")
         self.start_button.config(state='normal')
         self.stop_button.config(state='disabled')
@@ -969,15 +1835,11 @@ class SensitiveInfoGUI:
 
     def open_report(self):
         """打开报告文件"""
+        from tkinter import messagebox
         if os.path.exists(self.output_file.get()):
             try:
                 # 在默认程序中打开文件
-                if sys.platform.startswith('win'):
-                    os.startfile(self.output_file.get())
-                elif sys.platform.startswith('darwin'):
-                    os.system(f'open "{self.output_file.get()}"')
-                else:
-                    os.system(f'xdg-open "{self.output_file.get()}"')
+                _open_externally(self.output_file.get())
             except Exception as e:
                 messagebox.showerror("错误", f"无法打开报告文件: {str(e)}")
         else:
@@ -985,23 +1847,42 @@ class SensitiveInfoGUI:
 
     def reload_config(self):
         """重新加载配置"""
+        from tkinter import messagebox
+        if self.scanner and self.scanner.is_scanning:
+            messagebox.showwarning("警告", "扫描进行中，请在扫描结束后重新加载配置")
+            return
+
+        if not os.path.exists("patterns.json"):
+            messagebox.showerror("错误", "配置文件不存在，将在下次扫描时自动创建")
+            return
+
+        # 只解析并检查配置文件，不创建新的扫描器
+        ok, enabled_count, error = _validate_patterns_file("patterns.json")
+        if not ok:
+            self.refresh_config_info()
+            messagebox.showerror("错误", f"重新加载配置失败: {error}")
+            return
+
         try:
-            # 重新创建扫描器以加载新配置
-            test_scanner = SensitiveInfoExtractor()
-            messagebox.showinfo("成功", "配置已重新加载")
+            if self.scanner:
+                # 在现有扫描器上重新编译规则，失败时保留原有规则；没有扫描器时下次扫描直接读取新配置
+                self.scanner.reload_patterns()
         except Exception as e:
             messagebox.showerror("错误", f"重新加载配置失败: {str(e)}")
+            return
+
+        self.refresh_config_info()
+        if error:
+            messagebox.showwarning("警告", f"配置已重新加载，已启用 {enabled_count} 条规则\n{error}")
+        else:
+            messagebox.showinfo("成功", f"配置已重新加载，已启用 {enabled_count} 条规则")
 
     def edit_config(self):
         """编辑配置文件"""
+        from tkinter import messagebox
         config_path = "patterns.json"
         try:
-            if sys.platform.startswith('win'):
-                os.startfile(config_path)
-            elif sys.platform.startswith('darwin'):
-                os.system(f'open "{config_path}"')
-            else:
-                os.system(f'xdg-open "{config_path}"')
+            _open_externally(config_path)
         except Exception as e:
             messagebox.showerror("错误", f"无法打开配置文件: {str(e)}")
 
@@ -1033,13 +1914,13 @@ class SensitiveInfoGUI:
 
     def clear_results(self):
         """清空结果显示"""
-        # 清空统计信息
+        # 清空统计信息，已经为 0 的标签不再重新配置，避免多余的重绘
         for label in self.stats_labels.values():
-            label.config(text="0")
+            if str(label.cget('text')) != "0":
+                label.config(text="0")
 
-        # 清空树形视图
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
+        # 清空树形视图（一次调用删除全部节点）
+        self.result_tree.delete(*self.result_tree.get_children())
 
     def update_result_display(self):
         """更新结果显示"""
@@ -1054,38 +1935,19 @@ class SensitiveInfoGUI:
         # 更新详细结果
         self.result_tree.delete(*self.result_tree.get_children())
 
-        # 按敏感信息类型分组
-        pattern_summary = {}
-        for file_path, file_results in self.scanner.results.items():
-            for pattern_name, matches in file_results.items():
-                if pattern_name not in pattern_summary:
-                    pattern_summary[pattern_name] = []
-                pattern_summary[pattern_name].extend(matches)
-
-        # 添加到树形视图
-        for pattern_name, matches in pattern_summary.items():
+        # 添加到树形视图，规则名唯一，直接作为节点 ID，省去自动生成
+        insert = self.result_tree.insert
+        for pattern_name, count in self.scanner.pattern_counts.items():
             pattern_info = self.scanner.patterns[pattern_name]
             risk_level = pattern_info["risk_level"]
-            description = pattern_info["description"]
-            count = len(matches)
 
             # 根据风险等级设置颜色
-            if risk_level == "高":
-                tags = ('high_risk',)
-            elif risk_level == "中":
-                tags = ('medium_risk',)
-            else:
-                tags = ('low_risk',)
+            tags = (RISK_TAGS.get(risk_level, 'low_risk'),)
 
-            self.result_tree.insert('', 'end', values=(
-                pattern_name, count, risk_level, description
+            insert('', 'end', iid=pattern_name, values=(
+                pattern_name, count, risk_level, pattern_info["description"]
             ), tags=tags)
 
-        # 配置标签颜色
-        self.result_tree.tag_configure('high_risk', foreground='red')
-        self.result_tree.tag_configure('medium_risk', foreground='orange')
-        self.result_tree.tag_configure('low_risk', foreground='green')
-
     def on_tree_double_click(self, event):
         """树形视图双击事件"""
         item = self.result_tree.selection()[0]
@@ -1109,33 +1971,25 @@ class SensitiveInfoGUI:
         text_widget = scrolledtext.ScrolledText(detail_window, wrap=tk.WORD)
         text_widget.pack(fill='both', expand=True, padx=10, pady=10)
 
-        # 收集该类型的所有匹配信息
-        matches_info = []
-        for file_path, file_results in self.scanner.results.items():
-            if pattern_name in file_results:
-                for match, line_num in file_results[pattern_name]:
-                    matches_info.append((file_path, match, line_num))
+        # 该类型的所有匹配信息，已按文件分组
+        file_groups = self.scanner.by_pattern.get(pattern_name, {})
 
-        # 显示详细信息
-        text_widget.insert(tk.END, f"敏感信息类型: {pattern_name}\n")
-        text_widget.insert(tk.END, f"描述: {self.scanner.patterns[pattern_name]['description']}\n")
-        text_widget.insert(tk.END, f"风险等级: {self.scanner.patterns[pattern_name]['risk_level']}\n")
-        text_widget.insert(tk.END, f"发现数量: {len(matches_info)}\n")
-        text_widget.insert(tk.END, "-" * 50 + "\n\n")
+        # 显示详细信息，先拼接完整文本，再一次性插入文本框
+        parts = [
+            f"敏感信息类型: {pattern_name}\n",
+            f"描述: {self.scanner.patterns[pattern_name]['description']}\n",
+            f"风险等级: {self.scanner.patterns[pattern_name]['risk_level']}\n",
+            f"发现数量: {self.scanner.pattern_counts[pattern_name]}\n",
+            "-" * 50 + "\n\n",
+        ]
 
         # 按文件分组显示
-        file_groups = {}
-        for file_path, match, line_num in matches_info:
-            if file_path not in file_groups:
-                file_groups[file_path] = []
-            file_groups[file_path].append((match, line_num))
-
         for file_path, matches in file_groups.items():
-            text_widget.insert(tk.END, f"文件: {file_path}\n")
-            for match, line_num in matches:
-                text_widget.insert(tk.END, f"  行 {line_num}: {match}\n")
-            text_widget.insert(tk.END, "\n")
+            parts.append(f"文件: {file_path}\n")
+            parts.extend(f"  行 {line_num}: {match}\n" for match, line_num in matches)
+            parts.append("\n")
 
+        text_widget.insert('1.0', ''.join(parts))
         text_widget.config(state='disabled')
 
     def show_about(self):
@@ -1170,7 +2024,7 @@ class SensitiveInfoGUI:
 一个功能强大的敏感信息扫描工具
 
 ✨ 主要特性：
-• 多线程并发处理，支持2/4/8/16线程
+• 多进程并行处理，支持2/4/8/16个进程
 • 友好的GUI界面，实时进度显示
 • 配置文件分离，规则可自定义
 • 支持多种文件格式和编码
@@ -1223,11 +2077,14 @@ class SensitiveInfoGUI:
 
     def on_closing(self):
         """窗口关闭事件"""
+        from tkinter import messagebox
         if self.scanner and self.scanner.is_scanning:
             if messagebox.askokcancel("退出", "扫描正在进行中，确定要退出吗？"):
                 self.scanner.cancel_scan()
+                self.shutdown_scan_pool()
                 self.root.destroy()
         else:
+            self.shutdown_scan_pool()
             self.root.destroy()
 
 
@@ -1243,4 +2100,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，扫描子进程需要由此进入
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file